@@ -2,6 +2,23 @@ import sys
 from pathlib import Path
 from modular_data_lab.utils import create_module, list_modules, run_module, remove_module, backup_modules
 
+# Flag aliases, hoisted so no per-argument literal is rebuilt while
+# scanning argv
+_DATA_FLAGS = frozenset(("-d", "--data"))
+_CODE_FLAGS = frozenset(("-c", "--code"))
+_VERBOSE_FLAGS = frozenset(("-v", "--verbose"))
+
+# Command dispatch table: command -> (handler name, expected argc after
+# flag removal); an O(1) lookup replaces the if/elif chain in main
+_HANDLERS = {
+    "add": ("create_module", 3),
+    "list": ("list_modules", 2),
+    "run": ("run_module", 3),
+    "remove": ("remove_module", 3),
+    "setup": ("setup", 2),
+    "help": ("show_help", 2),
+}
+
 def show_help() -> None:
     """Show help information"""
 
@@ -21,6 +38,9 @@ def show_help() -> None:
   -d, --data    Backup only data directories
   -c, --code    Backup only code directories
 
+  🔧 Run Options:
+  -v, --verbose Show the full traceback when a module fails
+
 📁 Structure created for each module:
   modules/module_name/run.py           # Entry point
   modules/module_name/load_data.py     # Data loading
@@ -54,29 +74,41 @@ def main() -> None:
     
     command = sys.argv[1].lower()
 
-    # Parse flags
-    data_only = "-d" in sys.argv or "--data" in sys.argv
-    code_only = "-c" in sys.argv or "--code" in sys.argv
+    # Parse flags and build the cleaned argv in a single pass
+    data_only = False
+    code_only = False
+    verbose = False
+    clean_argv = []
+    for arg in sys.argv:
+        if arg in _DATA_FLAGS:
+            data_only = True
+        elif arg in _CODE_FLAGS:
+            code_only = True
+        elif arg in _VERBOSE_FLAGS:
+            verbose = True
+        else:
+            clean_argv.append(arg)
     
-    # Remove flags from argv for cleaner parsing
-    clean_argv = [arg for arg in sys.argv if arg not in ["-d", "--data", "-c", "--code"]]
-    
-    if command == "add" and len(clean_argv) == 3:  # Changed from sys.argv to clean_argv
-        create_module(clean_argv[2])
-    elif command == "list":
-        list_modules()
-    elif command == "run" and len(clean_argv) == 3:  # Changed from sys.argv to clean_argv
-        run_module(clean_argv[2])
-    elif command == "remove" and len(clean_argv) == 3:  # Changed from sys.argv to clean_argv
-        remove_module(clean_argv[2])
-    elif command == "backup" and len(clean_argv) == 4:  # 4 args: ['lab', 'backup', 'module', 'dir']
-        backup_modules(clean_argv[3], clean_argv[2], data_only, code_only)
-    elif command == "backup" and len(clean_argv) == 3:  # 3 args: ['lab', 'backup', 'dir']
-        backup_modules(clean_argv[2], None, data_only, code_only)
-    elif command == "setup":
-        setup()
-    elif command == "help":
-        show_help()
+    if command == "run" and verbose and len(clean_argv) == 3:
+        run_module(clean_argv[2], verbose=True)
+        return
+
+    if command == "backup":
+        # backup keeps its own branch: its argument count varies
+        if len(clean_argv) == 4:  # ['lab', 'backup', 'module', 'dir']
+            backup_modules(clean_argv[3], clean_argv[2], data_only, code_only)
+        elif len(clean_argv) == 3:  # ['lab', 'backup', 'dir']
+            backup_modules(clean_argv[2], None, data_only, code_only)
+        else:
+            print("❌ Invalid command")
+            show_help()
+        return
+
+    handler = _HANDLERS.get(command)
+    if handler is not None and len(clean_argv) == handler[1]:
+        # Resolve the handler by name at call time so the module-level
+        # functions remain swappable (e.g. by tests)
+        globals()[handler[0]](*clean_argv[2:])
     else:
         print("❌ Invalid command")
         show_help()
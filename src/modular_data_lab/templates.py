@@ -1,9 +1,10 @@
+import functools
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
 
-def get_templates() -> dict[str, str]:
-    """Hold templates for module files"""
-
-    # run.py content
-    run_content = '''"""Module {module_name}"""
+# run.py content
+_RUN_CONTENT = '''"""Module {module_name}"""
 
 from pathlib import Path
 import sys
@@ -17,10 +18,10 @@ def run() -> None:
     """Main execution function"""
 
     print(f"=== Module {module_name} ===")
-    
+
     data = load_data()
     results = analyze(data)
-    
+
     print(f"=== Finished ===")
 
 
@@ -28,8 +29,8 @@ if __name__ == "__main__":
     run()
 '''
 
-    # load_data.py content
-    load_data_content = '''"""Load data for {module_name}"""
+# load_data.py content
+_LOAD_DATA_CONTENT = '''"""Load data for {module_name}"""
 from pathlib import Path
 
 def load_data() -> None:
@@ -41,8 +42,8 @@ def load_data() -> None:
     pass
 '''
 
-    # analyze.py content
-    analyze_content = '''"""Analyze data for {module_name}"""
+# analyze.py content
+_ANALYZE_CONTENT = '''"""Analyze data for {module_name}"""
 
 def analyze(data) -> None:
     """Perform data analysis"""
@@ -51,8 +52,44 @@ def analyze(data) -> None:
     pass
 '''
 
-    return {
-        "run.py": run_content,
-        "load_data.py": load_data_content,
-        "analyze.py": analyze_content
-    }
\ No newline at end of file
+# Built once at import; every get_templates() call returns the same
+# mapping instead of reallocating the strings and the dict. Values are
+# interned so comparisons against the same text elsewhere in the process
+# collapse to pointer checks
+_TEMPLATES = {
+    "run.py": sys.intern(_RUN_CONTENT),
+    "load_data.py": sys.intern(_LOAD_DATA_CONTENT),
+    "analyze.py": sys.intern(_ANALYZE_CONTENT)
+}
+
+# Read-only view handed out by get_templates(): the backing dict is
+# shared, so a caller mutating it would corrupt create_module's templates
+TEMPLATES = MappingProxyType(_TEMPLATES)
+
+
+# Templates pre-split on their single placeholder: rendering is then one
+# join instead of a format mini-language parse per call
+_PARTS = {name: template.split("{module_name}") for name, template in _TEMPLATES.items()}
+
+
+def get_templates() -> Mapping[str, str]:
+    """Hold templates for module files (read-only view)"""
+    return TEMPLATES
+
+
+# The same parts pre-encoded to UTF-8, so file writers can join bytes
+# directly instead of encoding the whole rendered file per call
+_BYTE_PARTS = {name: [part.encode("utf-8") for part in parts] for name, parts in _PARTS.items()}
+
+
+@functools.lru_cache(maxsize=256)
+def render_bytes(file_name: str, module_name: str) -> bytes:
+    """Render a template as UTF-8 bytes ready to be written (memoized:
+    scaffolding the same module name repeatedly reuses the rendered bytes)
+    Args:
+        file_name (str): Template key, e.g. "run.py"
+        module_name (str): Name to substitute for the placeholder
+    Returns:
+        bytes: Rendered file content, UTF-8 encoded
+    """
+    return module_name.encode("utf-8").join(_BYTE_PARTS[file_name])
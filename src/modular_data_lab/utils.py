@@ -1,29 +1,227 @@
 from pathlib import Path
-import shutil
-import importlib.util
-import traceback
-from modular_data_lab.templates import get_templates
-from zipfile import ZipFile
+from collections import deque
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
+from modular_data_lab.templates import get_templates, render_bytes
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 from datetime import datetime
 import time
 
+# Files at or below this size are read in one shot and written with
+# writestr; larger files are streamed through the archive in chunks so
+# memory stays bounded by the in-flight reads instead of the largest file
+_STREAM_THRESHOLD = 4 * 1024 * 1024
+
+# Thread pool sizing for overlapping file reads with compression
+_READ_WORKERS = 8
+_MAX_INFLIGHT_READS = 16
+
+# Module file templates, fetched once at import
+_TEMPLATES = get_templates()
+
+# Units used by format_size, one per power of 1024
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Re-running an unchanged module in the same process skips the re-parse
+# and re-exec: the run callable is cached per path and invalidated as
+# soon as the file's mtime or size changes
+_RUN_CACHE: dict[str, tuple[int, int, object]] = {}
+
+# Indirection for the current working directory; swapping this function
+# avoids process-global os.chdir calls (which serialize parallel test
+# runs) when callers need a different starting point
+_cwd = os.getcwd
+
+@functools.lru_cache(maxsize=None)
+def _find_project_root(cwd: str) -> Path | None:
+    """Resolve the project root starting from a given directory
+    Args:
+        cwd (str): Directory to start the search from
+    Returns:
+        Path | None: The root directory path or None if not found
+    """
+
+    # Check if the starting directory is the root
+    if os.path.isdir(os.path.join(cwd, "modules")) or os.path.isdir(os.path.join(cwd, "data")):
+        return Path(cwd)
+
+    # Traverse up the directory tree with plain string arithmetic; a Path
+    # is only built at the boundary when a root is found
+    current = cwd
+    while True:
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+        if os.path.isdir(os.path.join(current, "modules")) and os.path.isdir(os.path.join(current, "data")):
+            return Path(current)
+
+
 def get_project_root() -> Path | None:
-    """Get the root directory of the project
+    """Get the root directory of the project (memoized per working directory)
     Returns:
         Path | None: The root directory path or None if not found
     """
+    return _find_project_root(_cwd())
 
-    current_path = Path.cwd()
 
-    # Check if the current directory is the root
-    if (current_path / "modules").exists() or (current_path / "data").exists():
-        return current_path
-    
-    # Traverse up the directory tree to find the root
-    for parent in current_path.parents:
-        if (parent / "modules").exists() and (parent / "data").exists():
-            return parent
-    return None
+def _iter_files(root: Path | str):
+    """Recursively yield regular files below a directory using os.scandir
+    Args:
+        root (Path | str): Directory to walk
+    Yields:
+        tuple[str, int]: Absolute file path and its size in bytes, taken
+        from the directory entry so no extra stat syscall is needed
+    """
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            scandir_it = os.scandir(directory)
+        except OSError:
+            continue
+        with scandir_it:
+            for entry in scandir_it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry.stat(follow_symlinks=False).st_size
+
+
+def _zip_compression() -> int:
+    """Pick the archive compression method
+    Returns:
+        int: ZIP_STORED when MDL_ZIP_COMPRESSION is "0" (useful for tests
+        or already-compressed data), ZIP_DEFLATED otherwise
+    """
+    return ZIP_STORED if os.environ.get("MDL_ZIP_COMPRESSION") == "0" else ZIP_DEFLATED
+
+
+def _zip_info(arc_name: str, date_time: tuple, compress_type: int) -> ZipInfo:
+    """Build the ZipInfo for an archive entry
+    Args:
+        arc_name (str): Name of the entry inside the archive
+        date_time (tuple): Timestamp shared by all entries of the backup run
+        compress_type (int): Compression method for the entry
+    Returns:
+        ZipInfo: Entry metadata ready to be written
+    """
+    info = ZipInfo(arc_name, date_time=date_time)
+    info.compress_type = compress_type
+    return info
+
+
+def _read_file_bytes(file_path: str) -> bytes:
+    """Read a whole file as bytes (thread-pool read task)
+    Args:
+        file_path (str): Path of the file to read
+    Returns:
+        bytes: File content
+    """
+    with open(file_path, "rb") as src:
+        return src.read()
+
+
+def _stream_zip_entry(zipf: ZipFile, file_path: str, arc_name: str, date_time: tuple, compress_type: int) -> None:
+    """Stream a large file into an open archive without buffering it whole
+    Args:
+        zipf (ZipFile): Open archive to write into
+        file_path (str): Path of the source file
+        arc_name (str): Name of the entry inside the archive
+        date_time (tuple): Timestamp shared by all entries of the backup run
+        compress_type (int): Compression method for the entry
+    """
+    # Lazy import: shutil is only needed on the backup/remove paths, not
+    # for CLI startup
+    import shutil
+
+    with zipf.open(_zip_info(arc_name, date_time, compress_type), "w", force_zip64=True) as dst, open(file_path, "rb", buffering=1 << 20) as src:
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+
+def _module_backup_roots(project_root: Path, module_name: str, data_only: bool, code_only: bool) -> list[tuple[Path, str]]:
+    """Collect the directories to archive for a module
+    Args:
+        project_root (Path): Root directory of the project
+        module_name (str): Name of the module
+        data_only (bool): Backup only data directories
+        code_only (bool): Backup only code directories
+    Returns:
+        list[tuple[Path, str]]: (source directory, archive prefix) pairs,
+        keeping only the directories that exist
+    """
+    roots = []
+    module_dir = project_root.joinpath("modules", module_name)
+    data_dir = project_root.joinpath("data", module_name)
+
+    if not data_only and os.path.isdir(module_dir):
+        roots.append((module_dir, "modules/" + module_name + "/"))
+    if not code_only and os.path.isdir(data_dir):
+        roots.append((data_dir, "data/" + module_name + "/"))
+    return roots
+
+
+def _roots_have_files(roots: list[tuple[Path, str]]) -> bool:
+    """Check whether any source directory contains at least one file
+    Args:
+        roots (list[tuple[Path, str]]): (source directory, archive prefix) pairs
+    Returns:
+        bool: True as soon as a first file is found
+    """
+    return any(True for src_root, _ in roots for _ in _iter_files(src_root))
+
+
+def _archive_roots(zipf: ZipFile, roots: list[tuple[Path, str]], executor: ThreadPoolExecutor) -> tuple[int, int]:
+    """Walk each source directory once and write its files to the archive
+    Args:
+        zipf (ZipFile): Open archive to write into
+        roots (list[tuple[Path, str]]): (source directory, archive prefix) pairs
+        executor (ThreadPoolExecutor): Pool used for file reads; owned by
+            the caller so one backup run shares a single pool across modules
+    Returns:
+        tuple[int, int]: Number of files written and their total size in bytes
+    """
+    files_added = 0
+    total_size = 0
+
+    # Entries written in one backup run legitimately share a single
+    # timestamp and compression method, resolved once instead of per entry
+    entry_date = time.localtime()[:6]
+    compress_type = _zip_compression()
+
+    # Small files are read by the caller's thread pool while this thread
+    # writes compressed entries (ZipFile is not thread-safe for writes);
+    # the pending deque caps in-flight reads to bound memory usage
+    pending = deque()
+
+    def write_oldest_pending() -> None:
+        nonlocal files_added
+        future, arc_name = pending.popleft()
+        zipf.writestr(_zip_info(arc_name, entry_date, compress_type), future.result())
+        files_added += 1
+
+    for src_root, arc_prefix in roots:
+        src_prefix = str(src_root) + os.sep
+        for file_path, size in _iter_files(src_root):
+            arc_name = arc_prefix + file_path[len(src_prefix):]
+            total_size += size
+
+            if size <= _STREAM_THRESHOLD:
+                if len(pending) >= _MAX_INFLIGHT_READS:
+                    write_oldest_pending()
+                pending.append((executor.submit(_read_file_bytes, file_path), arc_name))
+            else:
+                _stream_zip_entry(zipf, file_path, arc_name, entry_date, compress_type)
+                files_added += 1
+
+    # Drain before returning: every submitted read belongs to this call's
+    # roots and must land in the archive
+    while pending:
+        write_oldest_pending()
+
+    return files_added, total_size
 
 
 def create_module(module_name: str) -> None:
@@ -38,25 +236,36 @@ def create_module(module_name: str) -> None:
         return
 
 
-    module_dir = project_root / f"modules/{module_name}"
-    data_dir = project_root / f"data/{module_name}"
+    module_dir = project_root.joinpath("modules", module_name)
+    data_dir = project_root.joinpath("data", module_name)
+
+    # The parents usually exist already (get_project_root found them), so a
+    # plain mkdir is one syscall; fall back to makedirs only when a parent
+    # is actually missing instead of stat'ing the whole chain every time
+    for directory in (module_dir, data_dir):
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            os.makedirs(directory, exist_ok=True)
+
+
+    # Render and write the cached templates; render_bytes() joins
+    # pre-encoded template parts so nothing is re-encoded per file, and
+    # the raw os.open/write/close pair skips the TextIOWrapper machinery
+    for filename in _TEMPLATES:
+        content = render_bytes(filename, module_name)
+        fd = os.open(str(module_dir / filename), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
 
-    module_dir.mkdir(parents=True, exist_ok=True)
-    data_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Get templates
-    files = get_templates()
-    files = {filename: content.format(module_name=module_name) for filename, content in files.items()}
-
-    # Write files
-    for filename, content in files.items():
-        with open(module_dir / filename, "w") as f:
-            f.write(content)
-    
     print(f"✅ Module '{module_name}' created:")
     print(f"   📁 modules/{module_name}/")
     print(f"   📁 data/{module_name}/")
-    print(f"   📄 Files: {', '.join(files.keys())}")
+    print(f"   📄 Files: {', '.join(_TEMPLATES.keys())}")
 
 
 def list_modules() -> None:
@@ -70,43 +279,59 @@ def list_modules() -> None:
 
     modules_dir = project_root / "modules"
 
-    if not modules_dir.exists():
+    # os.path.isdir skips pathlib's per-call Path allocation on this
+    # predicate-only check
+    if not os.path.isdir(modules_dir):
         print("❌ Modules directory does not exist")
         print("💡 Run 'lab setup' to initialize the project structure")
         return
     
     # Get all directories in the modules directory
-    modules = [d.name for d in modules_dir.iterdir() if d.is_dir()]
-    
+    with os.scandir(modules_dir) as scandir_it:
+        modules = [entry.name for entry in scandir_it if entry.is_dir()]
+
     if not modules:
         print("📋 No module found")
         print("💡 Use 'lab add <module_name>'")
         return
 
-    print(f"📋 Available Modules ({len(modules)}):")
-    for module in sorted(modules):
-        data_path = Path(f"data/{module}")
-        
-        if data_path.exists():
-            # Get all files in the data directory
-            data_files = [f for f in data_path.rglob("*") if f.is_file()]
-            
-            if data_files:
-                # Compute total size of data files
-                total_size = sum(f.stat().st_size for f in data_files)
-                data_info = f"({len(data_files)} fichiers, {format_size(total_size)})"
+    # Resolve the data root once; per-module paths are plain string joins
+    data_root = str(project_root) + os.sep + "data" + os.sep
+
+    # In-place sort: the scandir list is ours, no copy needed
+    modules.sort()
+
+    # Accumulate the listing and emit it with one stdout write instead of
+    # one flushing print per module
+    lines = [f"📋 Available Modules ({len(modules)}):"]
+    for module in modules:
+        data_path = data_root + module
+
+        if os.path.isdir(data_path):
+            # Count files and accumulate sizes in a single scandir pass
+            file_count = 0
+            total_size = 0
+            for _, size in _iter_files(data_path):
+                file_count += 1
+                total_size += size
+
+            if file_count:
+                data_info = f"({file_count} fichiers, {format_size(total_size)})"
             else:
                 data_info = "(no data)"
         else:
             data_info = "(no data)"
-        
-        print(f"   📦 {module} {data_info}")
 
+        lines.append(f"   📦 {module} {data_info}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def run_module(module_name: str) -> None:
+
+def run_module(module_name: str, verbose: bool = False) -> None:
     """Run a specific module
     Args:
         module_name (str): Name of the module to run
+        verbose (bool): Print the full traceback when the module fails
     """
     project_root = get_project_root()
     if project_root is None:
@@ -114,23 +339,37 @@ def run_module(module_name: str) -> None:
         print("💡 Run 'lab setup' to initialize the project structure")
         return
 
-    module_path = project_root / f"modules/{module_name}/run.py"
+    module_path = str(project_root.joinpath("modules", module_name, "run.py"))
 
-    if not module_path.exists():
+    # A single stat probes existence and feeds the cache key below
+    try:
+        st = os.stat(module_path)
+    except OSError:
         print(f"❌ Module '{module_name}' not found")
         return False
-    
+
     try:
         print(f"▶️  Running: {module_name}")
 
-        # Import and run the module
-        spec = importlib.util.spec_from_file_location("module", module_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        cached = _RUN_CACHE.get(module_path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            run = cached[2]
+        else:
+            # Lazy import: runpy drags in pkgutil and friends, none of
+            # which the other CLI commands need
+            import runpy
+
+            # Execute the module file in a fresh namespace; run_name stays
+            # "module" so the template's __main__ guard doesn't fire and
+            # run() is only called once, explicitly, below
+            namespace = runpy.run_path(module_path, run_name="module")
+            run = namespace.get("run")
+            if run is not None:
+                _RUN_CACHE[module_path] = (st.st_mtime_ns, st.st_size, run)
 
         # Execute the module's run function
-        if hasattr(module, 'run'):
-            module.run()
+        if run is not None:
+            run()
             print(f"✅ Module '{module_name}' finished")
             return True
         else:
@@ -139,48 +378,74 @@ def run_module(module_name: str) -> None:
             
     except Exception as e:
         print(f"❌ An error occurred: {e}")
-        traceback.print_exc()
+
+        # traceback is only imported on the cold path; the one-line
+        # formatter is enough for most user errors, the full stack walk
+        # stays behind --verbose
+        import traceback
+        if verbose:
+            traceback.print_exc()
+        else:
+            sys.stderr.write("".join(traceback.format_exception_only(type(e), e)))
         return False
 
 
-def remove_module(module_name: str) -> None:
+def _confirm(prompt: str) -> bool:
+    """Default confirmation callback, reading y/N from stdin
+    Args:
+        prompt (str): Question shown to the user
+    Returns:
+        bool: True when the user answered 'y'
+    """
+    return input(prompt).lower() == 'y'
+
+
+def remove_module(module_name: str, confirm=_confirm) -> None:
     """Remove a module (modules and data directories)
     Args:
         module_name (str): Name of the module to remove
+        confirm (Callable[[str], bool]): Confirmation callback; defaults
+            to an interactive y/N prompt, callers can inject their own
+            for batch removals
     """
     project_root = get_project_root()
     if project_root is None:
         print("❌ Project root not found. You're not in a modular data lab project.")
         return
 
-    module_dir = project_root / f"modules/{module_name}"
-    data_dir = project_root / f"data/{module_name}"
+    module_dir = project_root.joinpath("modules", module_name)
+    data_dir = project_root.joinpath("data", module_name)
 
-    if not module_dir.exists():
+    if not os.path.isdir(module_dir):
         print(f"❌ Module '{module_name}' not found")
         return
     
     # Confirmation
-    response = input(f"⚠️  Remove module '{module_name}' and its data? (y/N): ")
-    if response.lower() != 'y':
+    if not confirm(f"⚠️  Remove module '{module_name}' and its data? (y/N): "):
         print("❌ Deletion canceled")
         return
 
-    # Deletion
-    if module_dir.exists():
-        shutil.rmtree(module_dir)
-        print(f"✅ Folder modules/{module_name}/ removed")
-    
-    if data_dir.exists():
-        shutil.rmtree(data_dir)
+    # Deletion (shutil imported lazily, see _stream_zip_entry); the check
+    # at the top already established module_dir exists, so no re-probe
+    import shutil
+
+    shutil.rmtree(module_dir)
+    print(f"✅ Folder modules/{module_name}/ removed")
+
+    # One stat decides both the removal and the message: no success claim
+    # for a data folder that never existed
+    if os.path.isdir(data_dir):
+        shutil.rmtree(data_dir, ignore_errors=True)
         print(f"✅ Folder data/{module_name}/ removed")
 
 
 def backup_modules(target_dir: str, module_name: str = None, data_only: bool = False, code_only: bool = False) -> None:
     """Backup modules to a zip file
     Args:
-        target_dir (str): Target directory for the backup
-        module_name (str, optional): Specific module to backup, None for all
+        target_dir (str): Target directory for the backup, or a writable
+            file-like object that receives the archive bytes directly
+        module_name (str | list, optional): Specific module to backup, a
+            list of modules to batch into one archive, or None for all
         data_only (bool): Backup only data directories
         code_only (bool): Backup only code directories
     """
@@ -191,15 +456,17 @@ def backup_modules(target_dir: str, module_name: str = None, data_only: bool = F
         print("❌ Project root not found. You're not in a modular data lab project.")
         return
     
-    # Validation du répertoire cible
-    target_dir = Path(target_dir)
-    if not target_dir.exists():
-        print(f"❌ Target directory '{target_dir}' does not exist")
-        return
-    
-    if not target_dir.is_dir():
-        print(f"❌ '{target_dir}' is not a directory")
-        return
+    # Validation du répertoire cible; a file-like target (e.g. io.BytesIO)
+    # receives the archive bytes directly and skips the directory checks
+    if not hasattr(target_dir, "write"):
+        target_dir = Path(target_dir)
+        if not os.path.exists(target_dir):
+            print(f"❌ Target directory '{target_dir}' does not exist")
+            return
+
+        if not os.path.isdir(target_dir):
+            print(f"❌ '{target_dir}' is not a directory")
+            return
     
     # Validation des flags
     if data_only and code_only:
@@ -208,16 +475,24 @@ def backup_modules(target_dir: str, module_name: str = None, data_only: bool = F
     
     # Déterminer les modules à sauvegarder
     modules_dir = project_root / "modules"
-    if not modules_dir.exists():
+    if not os.path.isdir(modules_dir):
         print("❌ No modules directory found")
         return
     
-    if module_name:
+    if isinstance(module_name, str):
         # Module spécifique
-        if not (modules_dir / module_name).exists():
+        if not os.path.isdir(modules_dir / module_name):
             print(f"❌ Module '{module_name}' not found")
             return
         modules = [module_name]
+    elif module_name:
+        # Liste explicite : les modules partent dans un seul zip, le projet
+        # n'est parcouru qu'une fois au lieu d'une fois par module
+        modules = list(module_name)
+        for name in modules:
+            if not os.path.isdir(modules_dir / name):
+                print(f"❌ Module '{name}' not found")
+                return
     else:
         # Tous les modules
         modules = [d.name for d in modules_dir.iterdir() if d.is_dir()]
@@ -228,11 +503,11 @@ def backup_modules(target_dir: str, module_name: str = None, data_only: bool = F
     # Créer le nom du fichier zip avec timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    if module_name:
+    if isinstance(module_name, str):
         # Backup d'un module spécifique
         backup_single_module(project_root, module_name, target_dir, timestamp, data_only, code_only)
     else:
-        # Backup de tous les modules dans un seul zip
+        # Backup de tous les modules (ou de la liste donnée) dans un seul zip
         backup_all_modules(project_root, modules, target_dir, timestamp, data_only, code_only)
 
 
@@ -255,57 +530,50 @@ def backup_single_module(project_root: Path, module_name: str, target_dir: Path,
         suffix = "_code"
     
     base_name = f"{module_name}_backup{suffix}"
-    zip_filename = generate_unique_filename(base_name, target_dir)
-    zip_path = target_dir / zip_filename
-    
-    module_dir = project_root / "modules" / module_name
-    data_dir = project_root / "data" / module_name
-    
+
+    # A file-like target is written in place; only a directory target
+    # needs an on-disk name
+    if hasattr(target_dir, "write"):
+        zip_path = None
+        zip_filename = f"{base_name}.zip"
+        zip_target = target_dir
+    else:
+        zip_filename = generate_unique_filename(base_name, target_dir)
+        zip_path = target_dir / zip_filename
+        zip_target = zip_path
+
     # Vérifier qu'au moins un des dossiers existe
-    if not module_dir.exists() and not data_dir.exists():
+    if not os.path.isdir(project_root.joinpath("modules", module_name)) and not os.path.isdir(project_root.joinpath("data", module_name)):
         print(f"❌ Neither code nor data found for module '{module_name}'")
         return
-    
-    files_added = 0
-    total_size = 0
-    
+
+    roots = _module_backup_roots(project_root, module_name, data_only, code_only)
+
+    # Probe before touching the filesystem: no zip is created (and later
+    # deleted) when there is nothing to back up
+    if not _roots_have_files(roots):
+        print(f"⚠️  No files found to backup for module '{module_name}'")
+        return
+
     try:
-        with ZipFile(zip_path, 'w') as zipf:
-            
-            # Backup du code
-            if not data_only and module_dir.exists():
-                for file_path in module_dir.rglob("*"):
-                    if file_path.is_file():
-                        arc_name = f"modules/{module_name}/{file_path.relative_to(module_dir)}"
-                        zipf.write(file_path, arc_name)
-                        files_added += 1
-                        total_size += file_path.stat().st_size
-            
-            # Backup des données
-            if not code_only and data_dir.exists():
-                for file_path in data_dir.rglob("*"):
-                    if file_path.is_file():
-                        arc_name = f"data/{module_name}/{file_path.relative_to(data_dir)}"
-                        zipf.write(file_path, arc_name)
-                        files_added += 1
-                        total_size += file_path.stat().st_size
-        
-        if files_added == 0:
-            print(f"⚠️  No files found to backup for module '{module_name}'")
-            zip_path.unlink()  # Supprimer le zip vide
-            return
-        
-        # Afficher le résultat
-        zip_size = zip_path.stat().st_size
-        print(f"✅ Module '{module_name}' backed up:")
-        print(f"   📁 Files: {files_added}")
-        print(f"   📊 Original size: {format_size(total_size)}")
-        print(f"   🗜️  Compressed size: {format_size(zip_size)}")
-        print(f"   📄 Saved as: {zip_filename}")
+        with ZipFile(zip_target, 'w', compression=_zip_compression(), compresslevel=6, allowZip64=True) as zipf, \
+                ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+            files_added, total_size = _archive_roots(zipf, roots, executor)
+
+
+        # Afficher le résultat (une seule écriture stdout)
+        zip_size = zip_path.stat().st_size if zip_path is not None else target_dir.tell()
+        sys.stdout.write("\n".join((
+            f"✅ Module '{module_name}' backed up:",
+            f"   📁 Files: {files_added}",
+            f"   📊 Original size: {format_size(total_size)}",
+            f"   🗜️  Compressed size: {format_size(zip_size)}",
+            f"   📄 Saved as: {zip_filename}",
+        )) + "\n")
         
     except Exception as e:
         print(f"❌ Error creating backup for '{module_name}': {e}")
-        if zip_path.exists():
+        if zip_path is not None and zip_path.exists():
             zip_path.unlink()
 
 
@@ -327,61 +595,60 @@ def backup_all_modules(project_root: Path, modules: list, target_dir: Path, time
         suffix = "_code"
     
     zip_filename = f"all_modules_backup{suffix}_{timestamp}.zip"
-    zip_path = target_dir / zip_filename
-    
+
+    # A file-like target is written in place; only a directory target
+    # needs an on-disk name
+    if hasattr(target_dir, "write"):
+        zip_path = None
+        zip_target = target_dir
+    else:
+        zip_path = target_dir / zip_filename
+        zip_target = zip_path
+
+    # Collect each module's roots once, reused by the probe and the write
+    # loop; no zip is created (and later deleted) when nothing matches
+    module_roots = [(name, _module_backup_roots(project_root, name, data_only, code_only)) for name in modules]
+    if not any(_roots_have_files(roots) for _, roots in module_roots):
+        print("⚠️  No files found to backup")
+        return
+
     files_added = 0
     total_size = 0
     modules_processed = 0
-    
+    module_lines = []
+
     try:
-        with ZipFile(zip_path, 'w') as zipf:
-            
-            for module_name in modules:
-                module_dir = project_root / "modules" / module_name
-                data_dir = project_root / "data" / module_name
-                module_files = 0
-                
-                # Backup du code
-                if not data_only and module_dir.exists():
-                    for file_path in module_dir.rglob("*"):
-                        if file_path.is_file():
-                            arc_name = f"modules/{module_name}/{file_path.relative_to(module_dir)}"
-                            zipf.write(file_path, arc_name)
-                            files_added += 1
-                            module_files += 1
-                            total_size += file_path.stat().st_size
-                
-                # Backup des données
-                if not code_only and data_dir.exists():
-                    for file_path in data_dir.rglob("*"):
-                        if file_path.is_file():
-                            arc_name = f"data/{module_name}/{file_path.relative_to(data_dir)}"
-                            zipf.write(file_path, arc_name)
-                            files_added += 1
-                            module_files += 1
-                            total_size += file_path.stat().st_size
-                
+        # One pool for the whole run: spawning and tearing down workers per
+        # module would dominate on projects with many small modules
+        with ZipFile(zip_target, 'w', compression=_zip_compression(), compresslevel=6, allowZip64=True) as zipf, \
+                ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+
+            for module_name, roots in module_roots:
+                module_files, module_size = _archive_roots(zipf, roots, executor)
+                files_added += module_files
+                total_size += module_size
+
                 if module_files > 0:
                     modules_processed += 1
-                    print(f"   📦 {module_name}: {module_files} files")
-        
-        if files_added == 0:
-            print("⚠️  No files found to backup")
-            zip_path.unlink()  # Supprimer le zip vide
-            return
-        
-        # Afficher le résultat
-        zip_size = zip_path.stat().st_size
-        print("✅ Backup completed:")
-        print(f"   📁 Modules: {modules_processed}/{len(modules)}")
-        print(f"   📄 Total files: {files_added}")
-        print(f"   📊 Original size: {format_size(total_size)}")
-        print(f"   🗜️  Compressed size: {format_size(zip_size)}")
-        print(f"   💾 Saved as: {zip_filename}")
+                    module_lines.append(f"   📦 {module_name}: {module_files} files")
+
+
+        # Afficher le résultat (une seule écriture stdout, lignes par
+        # module comprises)
+        zip_size = zip_path.stat().st_size if zip_path is not None else target_dir.tell()
+        module_lines.extend((
+            "✅ Backup completed:",
+            f"   📁 Modules: {modules_processed}/{len(modules)}",
+            f"   📄 Total files: {files_added}",
+            f"   📊 Original size: {format_size(total_size)}",
+            f"   🗜️  Compressed size: {format_size(zip_size)}",
+            f"   💾 Saved as: {zip_filename}",
+        ))
+        sys.stdout.write("\n".join(module_lines) + "\n")
         
     except Exception as e:
         print(f"❌ Error creating backup: {e}")
-        if zip_path.exists():
+        if zip_path is not None and zip_path.exists():
             zip_path.unlink()
 
 
@@ -392,16 +659,14 @@ def format_size(size_bytes: int) -> str:
     Returns:
         str: Formatted size string
     """
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0 B"
-    
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+
+    # bit_length picks the 1024^i unit directly: one arithmetic op instead
+    # of a float-division loop. Clamped to 0 for fractional sizes below 1,
+    # where int() truncates to 0 and bit_length - 1 would go negative
+    i = min(max((int(size_bytes).bit_length() - 1) // 10, 0), len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 def generate_unique_filename(base_name: str, target_dir: Path, extension: str = ".zip") -> str:
@@ -1,26 +1,9 @@
 import pytest
-import tempfile
-from pathlib import Path
-import os
-
+import shutil
 
-@pytest.fixture
-def temp_project():
-    """Crée un projet temporaire pour les tests"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        project_dir = Path(tmpdir) / "test_project"
-        project_dir.mkdir()
-        
-        # Créer la structure de base
-        (project_dir / "modules").mkdir()
-        (project_dir / "data").mkdir()
-        
-        # Créer un module de test avec des fichiers
-        test_module = project_dir / "modules" / "test_module"
-        test_module.mkdir()
-        
-        # Fichiers du module
-        (test_module / "run.py").write_text('''"""Module test_module"""
+# Contenu des fichiers du projet de référence, encodé une seule fois à
+# l'import du module
+_RUN_PY = b'''"""Module test_module"""
 
 from pathlib import Path
 import sys
@@ -38,69 +21,109 @@ def run() -> None:
 
 if __name__ == "__main__":
     run()
-''')
-        
-        (test_module / "load_data.py").write_text('''"""Load data for test_module"""
+'''
+
+_LOAD_DATA_PY = b'''"""Load data for test_module"""
 from pathlib import Path
 
 def load_data() -> str:
     """Load module data"""
     data_dir = Path(__file__).parent.parent.parent / "data" / "test_module"
     return "test_data"
-''')
-        
-        (test_module / "analyze.py").write_text('''"""Analyze data for test_module"""
+'''
+
+_ANALYZE_PY = b'''"""Analyze data for test_module"""
 
 def analyze(data) -> str:
     """Perform data analysis"""
     return f"analyzed_{data}"
-''')
-        
-        # Créer des données de test
-        test_data_dir = project_dir / "data" / "test_module"
-        test_data_dir.mkdir()
-        (test_data_dir / "data.csv").write_text("col1,col2\n1,2\n3,4\n")
-        (test_data_dir / "extra.txt").write_text("Extra test file")
-        
-        # Créer un deuxième module pour les tests "all modules"
-        second_module = project_dir / "modules" / "second_module"
-        second_module.mkdir()
-        (second_module / "run.py").write_text("# Second module")
-        
-        second_data = project_dir / "data" / "second_module"
-        second_data.mkdir()
-        (second_data / "data2.csv").write_text("a,b\n5,6\n")
-        
-        yield project_dir
+'''
+
+_SECOND_RUN_PY = b"# Second module"
+
+
+@pytest.fixture(scope="session")
+def _temp_project_template(tmp_path_factory):
+    """Arbre de projet de référence, construit une seule fois par session"""
+    project_dir = tmp_path_factory.mktemp("project_template") / "test_project"
+
+    # Créer uniquement les feuilles : les parents (test_project, modules/,
+    # data/) sont créés implicitement, 4 appels mkdir au lieu de 7
+    for sub in ("modules/test_module", "data/test_module",
+                "modules/second_module", "data/second_module"):
+        (project_dir / sub).mkdir(parents=True, exist_ok=True)
+
+    test_module = project_dir / "modules" / "test_module"
+
+    # Fichiers du module (write_bytes : pas de ré-encodage utf-8)
+    (test_module / "run.py").write_bytes(_RUN_PY)
+    (test_module / "load_data.py").write_bytes(_LOAD_DATA_PY)
+    (test_module / "analyze.py").write_bytes(_ANALYZE_PY)
+    
+    # Créer des données de test
+    test_data_dir = project_dir / "data" / "test_module"
+    (test_data_dir / "data.csv").write_text("col1,col2\n1,2\n3,4\n")
+    (test_data_dir / "extra.txt").write_text("Extra test file")
+    
+    # Créer un deuxième module pour les tests "all modules"
+    second_module = project_dir / "modules" / "second_module"
+    (second_module / "run.py").write_bytes(_SECOND_RUN_PY)
+    
+    second_data = project_dir / "data" / "second_module"
+    (second_data / "data2.csv").write_text("a,b\n5,6\n")
+    
+    return project_dir
+
+
+@pytest.fixture
+def temp_project(tmp_path, _temp_project_template):
+    """Copie par test du projet de référence (isolée des mutations)"""
+    project_dir = tmp_path / "test_project"
+    shutil.copytree(_temp_project_template, project_dir)
+    return project_dir
 
 
 @pytest.fixture
 def mock_cwd(monkeypatch, temp_project):
     """Mock du répertoire courant - positionne dans la racine du projet"""
-    original_cwd = os.getcwd()
-    monkeypatch.chdir(temp_project)
-    yield temp_project
-    monkeypatch.chdir(original_cwd)
+    # Patcher l'indirection _cwd évite un os.chdir global au processus
+    monkeypatch.setattr("modular_data_lab.utils._cwd", lambda: str(temp_project))
+    return temp_project
 
 
 @pytest.fixture
 def mock_cwd_in_modules(monkeypatch, temp_project):
     """Mock du répertoire courant - positionne dans le dossier modules/"""
-    original_cwd = os.getcwd()
     modules_dir = temp_project / "modules"
-    monkeypatch.chdir(modules_dir)
-    yield modules_dir
-    monkeypatch.chdir(original_cwd)
+    monkeypatch.setattr("modular_data_lab.utils._cwd", lambda: str(modules_dir))
+    return modules_dir
+
+
+@pytest.fixture(scope="session")
+def _outside_root(tmp_path_factory):
+    """Répertoire hors projet, créé une seule fois par session"""
+    return tmp_path_factory.mktemp("outside")
 
 
 @pytest.fixture
-def mock_cwd_outside_project(monkeypatch):
+def mock_cwd_outside_project(monkeypatch, _outside_root):
     """Mock du répertoire courant - positionne en dehors du projet"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        original_cwd = os.getcwd()
-        monkeypatch.chdir(tmpdir)
-        yield Path(tmpdir)
-        monkeypatch.chdir(original_cwd)
+    monkeypatch.setattr("modular_data_lab.utils._cwd", lambda: str(_outside_root))
+    return _outside_root
+
+
+@pytest.fixture(scope="session")
+def templates():
+    """Dictionnaire des templates de module, résolu une fois par session"""
+    from modular_data_lab.templates import get_templates
+    return get_templates()
+
+
+@pytest.fixture(autouse=True)
+def _stored_zip_compression(monkeypatch):
+    """Désactive DEFLATE pour les backups : les tests ne vérifient que
+    namelist(), la compression est du CPU perdu"""
+    monkeypatch.setenv("MDL_ZIP_COMPRESSION", "0")
 
 
 @pytest.fixture
@@ -1,12 +1,18 @@
-from pathlib import Path
-import sys
+import io
+import os
+import shutil
 import zipfile
 
-# Import the module under test
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from modular_data_lab.utils import backup_modules
 
 
+def zips(directory, prefix=""):
+    """Instantané du dossier de backups : un seul os.listdir par groupe
+    d'assertions, sans la compilation fnmatch de pathlib.glob"""
+    return sorted(name for name in os.listdir(directory)
+                  if name.endswith(".zip") and name.startswith(prefix))
+
+
 class TestBackupModules:
     
     def test_backup_single_module_success(self, mock_cwd, backup_target, capsys):
@@ -14,14 +20,15 @@ class TestBackupModules:
         backup_modules(str(backup_target), "test_module")
         
         # Vérifier qu'un fichier zip a été créé
-        zip_files = list(backup_target.glob("test_module_backup_*.zip"))
+        zip_files = zips(backup_target, "test_module_backup_")
         assert len(zip_files) == 1
         
-        zip_file = zip_files[0]
+        zip_file = backup_target / zip_files[0]
         
         # Vérifier le contenu du zip
         with zipfile.ZipFile(zip_file, 'r') as zf:
-            files = zf.namelist()
+            # frozenset : les "in files" deviennent O(1)
+            files = frozenset(zf.namelist())
             
             # Vérifier la structure
             assert "modules/test_module/run.py" in files
@@ -42,14 +49,15 @@ class TestBackupModules:
         backup_modules(str(backup_target))
         
         # Vérifier qu'un fichier zip a été créé
-        zip_files = list(backup_target.glob("all_modules_backup_*.zip"))
+        zip_files = zips(backup_target, "all_modules_backup_")
         assert len(zip_files) == 1
         
-        zip_file = zip_files[0]
+        zip_file = backup_target / zip_files[0]
         
         # Vérifier le contenu du zip
         with zipfile.ZipFile(zip_file, 'r') as zf:
-            files = zf.namelist()
+            # frozenset : les "in files" deviennent O(1)
+            files = frozenset(zf.namelist())
             
             # Vérifier que les deux modules sont présents
             assert "modules/test_module/run.py" in files
@@ -68,19 +76,21 @@ class TestBackupModules:
         """Test backup data seulement"""
         backup_modules(str(backup_target), "test_module", data_only=True)
         
-        zip_files = list(backup_target.glob("test_module_backup_data_*.zip"))
+        zip_files = zips(backup_target, "test_module_backup_data_")
         assert len(zip_files) == 1
         
         # Vérifier le contenu du zip
-        with zipfile.ZipFile(zip_files[0], 'r') as zf:
-            files = zf.namelist()
+        with zipfile.ZipFile(backup_target / zip_files[0], 'r') as zf:
+            # Liste pour le scan par sous-chaîne, frozenset pour les "in"
+            names = zf.namelist()
+            files = frozenset(names)
             
             # Seulement les fichiers data/
             assert "data/test_module/data.csv" in files
             assert "data/test_module/extra.txt" in files
             
             # Pas de fichiers modules/
-            assert not any("modules/" in f for f in files)
+            assert not any("modules/" in f for f in names)
         
         captured = capsys.readouterr()
         assert "📁 Files: 2" in captured.out
@@ -89,12 +99,14 @@ class TestBackupModules:
         """Test backup code seulement"""
         backup_modules(str(backup_target), "test_module", code_only=True)
         
-        zip_files = list(backup_target.glob("test_module_backup_code_*.zip"))
+        zip_files = zips(backup_target, "test_module_backup_code_")
         assert len(zip_files) == 1
         
         # Vérifier le contenu du zip
-        with zipfile.ZipFile(zip_files[0], 'r') as zf:
-            files = zf.namelist()
+        with zipfile.ZipFile(backup_target / zip_files[0], 'r') as zf:
+            # Liste pour le scan par sous-chaîne, frozenset pour les "in"
+            names = zf.namelist()
+            files = frozenset(names)
             
             # Seulement les fichiers modules/
             assert "modules/test_module/run.py" in files
@@ -102,7 +114,7 @@ class TestBackupModules:
             assert "modules/test_module/analyze.py" in files
             
             # Pas de fichiers data/
-            assert not any("data/" in f for f in files)
+            assert not any("data/" in f for f in names)
         
         captured = capsys.readouterr()
         assert "📁 Files: 3" in captured.out
@@ -112,7 +124,7 @@ class TestBackupModules:
         backup_modules(str(backup_target), "test_module", data_only=True, code_only=True)
         
         # Aucun zip ne devrait être créé
-        zip_files = list(backup_target.glob("*.zip"))
+        zip_files = zips(backup_target)
         assert len(zip_files) == 0
         
         captured = capsys.readouterr()
@@ -123,7 +135,7 @@ class TestBackupModules:
         backup_modules(str(backup_target), "nonexistent_module")
         
         # Aucun zip ne devrait être créé
-        zip_files = list(backup_target.glob("*.zip"))
+        zip_files = zips(backup_target)
         assert len(zip_files) == 0
         
         captured = capsys.readouterr()
@@ -164,7 +176,7 @@ class TestBackupModules:
         backup_modules(str(backup_target), "empty_module")
         
         # Aucun zip ne devrait être créé (ou supprimé s'il était vide)
-        zip_files = list(backup_target.glob("empty_module_backup_*.zip"))
+        zip_files = zips(backup_target, "empty_module_backup_")
         assert len(zip_files) == 0
         
         captured = capsys.readouterr()
@@ -172,7 +184,6 @@ class TestBackupModules:
     
     def test_backup_no_modules_directory(self, mock_cwd, backup_target, capsys):
         """Test backup quand il n'y a pas de dossier modules/"""
-        import shutil
         shutil.rmtree(mock_cwd / "modules")
         
         backup_modules(str(backup_target))
@@ -180,9 +191,23 @@ class TestBackupModules:
         captured = capsys.readouterr()
         assert "❌ No modules directory found" in captured.out
     
+    def test_backup_to_file_like_target(self, mock_cwd, capsys):
+        """Test backup vers un objet fichier en mémoire : aucune écriture
+        disque, le zip est vérifié directement depuis le buffer"""
+        buffer = io.BytesIO()
+        backup_modules(buffer, "test_module")
+
+        with zipfile.ZipFile(buffer, 'r') as zf:
+            files = frozenset(zf.namelist())
+            assert "modules/test_module/run.py" in files
+            assert "data/test_module/data.csv" in files
+
+        captured = capsys.readouterr()
+        assert "✅ Module 'test_module' backed up:" in captured.out
+        assert "📁 Files: 5" in captured.out
+
     def test_backup_all_modules_empty_project(self, mock_cwd, backup_target, capsys):
         """Test backup de tous les modules dans un projet vide"""
-        import shutil
         # Vider le dossier modules
         shutil.rmtree(mock_cwd / "modules")
         (mock_cwd / "modules").mkdir()
@@ -199,10 +224,10 @@ class TestBackupFileStructure:
         """Test que les noms de fichiers incluent un timestamp"""
         backup_modules(str(backup_target), "test_module")
         
-        zip_files = list(backup_target.glob("test_module_backup_*.zip"))
+        zip_files = zips(backup_target, "test_module_backup_")
         assert len(zip_files) == 1
         
-        zip_name = zip_files[0].name
+        zip_name = zip_files[0]
         # Le nom devrait contenir un timestamp au format YYYYMMDD_HHMMSS
         assert len(zip_name.split('_')[-1].replace('.zip', '')) == 6  # HHMMSS
         assert len(zip_name.split('_')[-2]) == 8  # YYYYMMDD
@@ -211,10 +236,10 @@ class TestBackupFileStructure:
         """Test noms de fichiers pour backup de tous les modules"""
         backup_modules(str(backup_target))
         
-        zip_files = list(backup_target.glob("all_modules_backup_*.zip"))
+        zip_files = zips(backup_target, "all_modules_backup_")
         assert len(zip_files) == 1
         
-        zip_name = zip_files[0].name
+        zip_name = zip_files[0]
         assert zip_name.startswith("all_modules_backup_")
     
     def test_multiple_backups_no_overwrite(self, mock_cwd, backup_target):
@@ -223,8 +248,8 @@ class TestBackupFileStructure:
         backup_modules(str(backup_target), "test_module")
         
         # Devrait y avoir 2 fichiers zip différents
-        zip_files = list(backup_target.glob("test_module_backup_*.zip"))
+        zip_files = zips(backup_target, "test_module_backup_")
         assert len(zip_files) == 2
         
         # Les noms devraient être différents
-        assert zip_files[0].name != zip_files[1].name
+        assert zip_files[0] != zip_files[1]
@@ -1,9 +1,7 @@
-from pathlib import Path
-import sys
 from unittest.mock import patch
 
-# Import the module under test
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
+
 from modular_data_lab.run import main, show_help, setup
 
 
@@ -60,7 +58,7 @@ class TestMain:
         assert "📋 Available Commands:" in captured.out
     
     @patch('modular_data_lab.run.create_module')
-    def test_main_add_command(self, mock_create, capsys):
+    def test_main_add_command(self, mock_create):
         """Test commande add"""
         with patch('sys.argv', ['lab', 'add', 'test_module']):
             main()
@@ -68,7 +66,7 @@ class TestMain:
         mock_create.assert_called_once_with('test_module')
     
     @patch('modular_data_lab.run.list_modules')
-    def test_main_list_command(self, mock_list, capsys):
+    def test_main_list_command(self, mock_list):
         """Test commande list"""
         with patch('sys.argv', ['lab', 'list']):
             main()
@@ -76,15 +74,23 @@ class TestMain:
         mock_list.assert_called_once()
     
     @patch('modular_data_lab.run.run_module')
-    def test_main_run_command(self, mock_run, capsys):
+    def test_main_run_command(self, mock_run):
         """Test commande run"""
         with patch('sys.argv', ['lab', 'run', 'test_module']):
             main()
         
         mock_run.assert_called_once_with('test_module')
     
+    @patch('modular_data_lab.run.run_module')
+    def test_main_run_command_verbose(self, mock_run):
+        """Test commande run avec flag --verbose"""
+        with patch('sys.argv', ['lab', 'run', 'test_module', '-v']):
+            main()
+
+        mock_run.assert_called_once_with('test_module', verbose=True)
+
     @patch('modular_data_lab.run.remove_module')
-    def test_main_remove_command(self, mock_remove, capsys):
+    def test_main_remove_command(self, mock_remove):
         """Test commande remove"""
         with patch('sys.argv', ['lab', 'remove', 'test_module']):
             main()
@@ -92,7 +98,7 @@ class TestMain:
         mock_remove.assert_called_once_with('test_module')
     
     @patch('modular_data_lab.run.setup')
-    def test_main_setup_command(self, mock_setup, capsys):
+    def test_main_setup_command(self, mock_setup):
         """Test commande setup"""
         with patch('sys.argv', ['lab', 'setup']):
             main()
@@ -100,7 +106,7 @@ class TestMain:
         mock_setup.assert_called_once()
     
     @patch('modular_data_lab.run.backup_modules')
-    def test_main_backup_single_module(self, mock_backup, capsys):
+    def test_main_backup_single_module(self, mock_backup):
         """Test backup d'un module spécifique"""
         with patch('sys.argv', ['lab', 'backup', 'test_module', './backups']):
             main()
@@ -108,7 +114,7 @@ class TestMain:
         mock_backup.assert_called_once_with('./backups', 'test_module', False, False)
     
     @patch('modular_data_lab.run.backup_modules')
-    def test_main_backup_all_modules(self, mock_backup, capsys):
+    def test_main_backup_all_modules(self, mock_backup):
         """Test backup de tous les modules"""
         with patch('sys.argv', ['lab', 'backup', './backups']):
             main()
@@ -116,7 +122,7 @@ class TestMain:
         mock_backup.assert_called_once_with('./backups', None, False, False)
     
     @patch('modular_data_lab.run.backup_modules')
-    def test_main_backup_with_data_flag(self, mock_backup, capsys):
+    def test_main_backup_with_data_flag(self, mock_backup):
         """Test backup avec flag --data"""
         with patch('sys.argv', ['lab', 'backup', 'test_module', './backups', '-d']):
             main()
@@ -124,7 +130,7 @@ class TestMain:
         mock_backup.assert_called_once_with('./backups', 'test_module', True, False)
     
     @patch('modular_data_lab.run.backup_modules')
-    def test_main_backup_with_code_flag(self, mock_backup, capsys):
+    def test_main_backup_with_code_flag(self, mock_backup):
         """Test backup avec flag --code"""
         with patch('sys.argv', ['lab', 'backup', 'test_module', './backups', '--code']):
             main()
@@ -132,7 +138,7 @@ class TestMain:
         mock_backup.assert_called_once_with('./backups', 'test_module', False, True)
     
     @patch('modular_data_lab.run.backup_modules')
-    def test_main_backup_all_with_flags(self, mock_backup, capsys):
+    def test_main_backup_all_with_flags(self, mock_backup):
         """Test backup de tous les modules avec flags"""
         with patch('sys.argv', ['lab', 'backup', './backups', '-d']):
             main()
@@ -175,7 +181,11 @@ class TestMain:
 
 class TestFlagParsing:
     """Tests spécifiques pour le parsing des flags"""
-    
+
+    # Ces tests ne vérifient que les arguments passés au mock : le tracing
+    # de couverture n'y apporte rien, autant le couper (marqueur pytest-cov)
+    pytestmark = pytest.mark.no_cover
+
     @patch('modular_data_lab.run.backup_modules')
     def test_flag_parsing_both_short_and_long(self, mock_backup):
         """Test que les flags courts et longs sont reconnus"""
@@ -1,14 +1,52 @@
-from pathlib import Path
-import sys
+import os
+import shutil
 import zipfile
 from unittest.mock import patch
 
-# Import the modules under test
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
+
 from modular_data_lab.run import setup
 from modular_data_lab.utils import create_module, run_module, backup_modules, list_modules, remove_module
 
 
+@pytest.fixture(scope="module")
+def initialized_project(tmp_path_factory):
+    """Projet initialisé avec un module, construit une seule fois : les
+    tests qui le modifient en prennent une copie via shutil.copytree"""
+    project_dir = tmp_path_factory.mktemp("initialized_project")
+    original_cwd = os.getcwd()
+    os.chdir(project_dir)
+    try:
+        setup()
+        create_module("workflow_module")
+    finally:
+        os.chdir(original_cwd)
+    return project_dir
+
+
+@pytest.fixture(scope="module")
+def prepared_project(tmp_path_factory):
+    """Projet avec un module et ses fichiers, construit une seule fois
+    pour tous les cas d'options de backup (les backups ne le modifient pas)"""
+    project_dir = tmp_path_factory.mktemp("options_project")
+    original_cwd = os.getcwd()
+    os.chdir(project_dir)
+    try:
+        setup()
+        create_module("test_options")
+
+        # Ajouter plusieurs fichiers
+        module_dir = project_dir / "modules" / "test_options"
+        (module_dir / "extra_code.py").write_text("# Extra code file")
+
+        data_dir = project_dir / "data" / "test_options"
+        (data_dir / "dataset1.csv").write_text("data1\n")
+        (data_dir / "dataset2.csv").write_text("data2\n")
+    finally:
+        os.chdir(original_cwd)
+    return project_dir
+
+
 class TestFullWorkflow:
     """Tests d'intégration pour le workflow complet"""
     
@@ -53,7 +91,7 @@ class TestFullWorkflow:
         
         # Vérifier le contenu du backup
         with zipfile.ZipFile(zip_files[0], 'r') as zf:
-            files = zf.namelist()
+            files = frozenset(zf.namelist())
             assert "modules/integration_test/run.py" in files
             assert "data/integration_test/test_data.csv" in files
         
@@ -99,95 +137,84 @@ class TestFullWorkflow:
         assert len(zip_files) == 1
         
         with zipfile.ZipFile(zip_files[0], 'r') as zf:
-            files = zf.namelist()
+            files = frozenset(zf.namelist())
             for module_name in modules:
                 assert f"modules/{module_name}/run.py" in files
                 assert f"data/{module_name}/{module_name}_data.csv" in files
         
-        # Backup sélectif de modules individuels
-        for module_name in modules:
-            backup_modules(str(backup_target), module_name, data_only=True)
-        
-        # Vérifier qu'on a maintenant 4 zips (1 all + 3 individuels)
+        # Backup sélectif des modules en un seul appel batché : une seule
+        # traversée du projet au lieu d'une par module
+        backup_modules(str(backup_target), modules, data_only=True)
+
+        # Vérifier qu'on a maintenant 2 zips (1 all + 1 batché data)
         all_zips = list(backup_target.glob("*.zip"))
-        assert len(all_zips) == 4  # 1 all_modules + 3 individuels
+        assert len(all_zips) == 2  # 1 all_modules + 1 batch data
+
+        # Le zip batché contient bien les données des 3 modules
+        batch_zip = list(backup_target.glob("all_modules_backup_data_*.zip"))
+        assert len(batch_zip) == 1
+        with zipfile.ZipFile(batch_zip[0], 'r') as zf:
+            files = frozenset(zf.namelist())
+            for module_name in modules:
+                assert f"data/{module_name}/{module_name}_data.csv" in files
     
-    def test_workflow_with_different_backup_options(self, tmp_path, monkeypatch, backup_target):
+    @pytest.mark.parametrize("flags,marker", [
+        ({}, None),
+        ({"data_only": True}, "_data_"),
+        ({"code_only": True}, "_code_"),
+    ])
+    def test_workflow_with_different_backup_options(self, prepared_project, monkeypatch, backup_target, flags, marker):
         """Test workflow avec différentes options de backup"""
-        monkeypatch.chdir(tmp_path)
-        
-        # Setup et création d'un module
-        setup()
-        create_module("test_options")
+        monkeypatch.chdir(prepared_project)
         
-        # Ajouter plusieurs fichiers
-        module_dir = tmp_path / "modules" / "test_options"
-        (module_dir / "extra_code.py").write_text("# Extra code file")
+        backup_modules(str(backup_target), "test_options", **flags)
         
-        data_dir = tmp_path / "data" / "test_options"
-        (data_dir / "dataset1.csv").write_text("data1\n")
-        (data_dir / "dataset2.csv").write_text("data2\n")
-        
-        # Test backup complet
-        backup_modules(str(backup_target), "test_options")
-        
-        # Test backup data seulement
-        backup_modules(str(backup_target), "test_options", data_only=True)
-        
-        # Test backup code seulement
-        backup_modules(str(backup_target), "test_options", code_only=True)
-        
-        # Vérifier qu'on a 3 zips différents
+        # Un zip par cas, nommé selon l'option utilisée
         zip_files = list(backup_target.glob("*.zip"))
-        assert len(zip_files) == 3
+        assert len(zip_files) == 1
         
-        # Vérifier les noms des fichiers
-        filenames = [f.name for f in zip_files]
-        assert any("test_options_backup_" in name and "_data_" in name for name in filenames)
-        assert any("test_options_backup_" in name and "_code_" in name for name in filenames)
-        assert any("test_options_backup_" in name and "_data_" not in name and "_code_" not in name for name in filenames)
+        name = zip_files[0].name
+        assert "test_options_backup_" in name
+        if marker is None:
+            assert "_data_" not in name and "_code_" not in name
+        else:
+            assert marker in name
 
 
 class TestErrorRecovery:
     """Tests de récupération d'erreurs et cas limites"""
     
-    def test_workflow_with_corrupted_module(self, tmp_path, monkeypatch, capsys):
+    def test_workflow_with_corrupted_module(self, initialized_project, tmp_path, monkeypatch, capsys):
         """Test workflow avec un module corrompu"""
-        monkeypatch.chdir(tmp_path)
-        
-        setup()
-        create_module("corrupted_module")
+        # Copie par test : ce test corrompt le module
+        project_dir = tmp_path / "project"
+        shutil.copytree(initialized_project, project_dir)
+        monkeypatch.chdir(project_dir)
         
         # Corrompre le fichier run.py
-        module_dir = tmp_path / "modules" / "corrupted_module"
+        module_dir = project_dir / "modules" / "workflow_module"
         (module_dir / "run.py").write_text("invalid python syntax !!!!")
         
         # Essayer d'exécuter le module corrompu
-        result = run_module("corrupted_module")
+        result = run_module("workflow_module")
         assert result is False
         
         captured = capsys.readouterr()
         assert "❌ An error occurred:" in captured.out
     
-    def test_workflow_in_subdirectory(self, tmp_path, monkeypatch, backup_target):
+    def test_workflow_in_subdirectory(self, initialized_project, monkeypatch, backup_target):
         """Test workflow depuis un sous-répertoire"""
-        monkeypatch.chdir(tmp_path)
-        
-        # Setup du projet
-        setup()
-        create_module("subdir_test")
-        
-        # Se déplacer dans le dossier modules
-        modules_dir = tmp_path / "modules"
+        # Se placer dans le dossier modules (le backup ne modifie pas le projet)
+        modules_dir = initialized_project / "modules"
         monkeypatch.chdir(modules_dir)
         
         # Les opérations devraient toujours fonctionner
-        backup_modules(str(backup_target), "subdir_test")
+        backup_modules(str(backup_target), "workflow_module")
         
         zip_files = list(backup_target.glob("*.zip"))
         assert len(zip_files) == 1
     
-    def test_partial_project_structure(self, tmp_path, monkeypatch, capsys):
+    def test_partial_project_structure(self, tmp_path, monkeypatch):
         """Test avec structure de projet incomplète"""
         monkeypatch.chdir(tmp_path)
         
@@ -205,19 +232,16 @@ class TestErrorRecovery:
 class TestConcurrentOperations:
     """Tests de gestion des opérations concurrentes"""
     
-    def test_multiple_backups_same_module(self, tmp_path, monkeypatch, backup_target):
+    def test_multiple_backups_same_module(self, initialized_project, monkeypatch, backup_target):
         """Test backups multiples du même module"""
-        monkeypatch.chdir(tmp_path)
-        
-        setup()
-        create_module("concurrent_test")
+        monkeypatch.chdir(initialized_project)
         
         # Faire plusieurs backups rapidement
         for i in range(3):
-            backup_modules(str(backup_target), "concurrent_test")
+            backup_modules(str(backup_target), "workflow_module")
         
         # Tous les backups devraient exister avec des noms différents
-        zip_files = list(backup_target.glob("concurrent_test_backup_*.zip"))
+        zip_files = list(backup_target.glob("workflow_module_backup_*.zip"))
         assert len(zip_files) == 3
         
         # Vérifier que tous les noms sont différents